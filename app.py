@@ -1,10 +1,13 @@
 import os
-from typing import Any
+from functools import partial
+from threading import Thread
+from typing import Any, Callable, Iterable, Iterator
 
-from flask import Flask, jsonify, redirect, render_template, request, session, url_for
+import orjson
+from flask import Flask, Response, flash, get_flashed_messages, jsonify, redirect, render_template, request, url_for
 
 from monitor import TikTokMonitorService
-from scraper import TikTokScrapeError, fetch_tiktok_profile, normalize_username
+from scraper import TikTokScrapeError, fetch_tiktok_profile, normalize_username, warm_up
 from storage import MonitorStore
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -93,6 +96,15 @@ SETTING_DEFINITIONS: dict[str, dict[str, Any]] = {
         "restart_required": False,
         "description": "Default number of snapshots returned for account history.",
     },
+    "history_retention_days": {
+        "label": "History retention (days)",
+        "type": "int",
+        "default": 0,
+        "min": 0,
+        "max": 3650,
+        "restart_required": False,
+        "description": "Purge history older than this after each cycle, keeping each latest snapshot (0 keeps all).",
+    },
 }
 
 SETTINGS_ORDER = list(SETTING_DEFINITIONS.keys())
@@ -104,35 +116,62 @@ def _parse_bool(value: str | None, default: bool) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "on"}
 
 
-def _serialize_setting_value(key: str, value: Any) -> str:
-    setting_type = SETTING_DEFINITIONS[key]["type"]
-    if setting_type == "bool":
-        return "1" if bool(value) else "0"
-    return str(value)
+def _serialize_bool_setting(value: Any) -> str:
+    return "1" if bool(value) else "0"
 
 
-def _parse_setting_value(key: str, raw: str | int | bool) -> Any:
-    definition = SETTING_DEFINITIONS[key]
-    setting_type = definition["type"]
+def _parse_bool_setting(raw: str | int | bool, default: bool) -> bool:
+    if isinstance(raw, bool):
+        return raw
+    return _parse_bool(str(raw), default)
+
+
+def _parse_int_setting(raw: str | int | bool, label: str, min_value: int | None, max_value: int | None) -> int:
+    try:
+        parsed = int(raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{label} must be a valid integer.") from exc
+
+    low = parsed if min_value is None else min_value
+    high = parsed if max_value is None else max_value
+    if parsed < low or parsed > high:
+        raise ValueError(f"{label} must be between {low} and {high}.")
+    return parsed
 
-    if setting_type == "bool":
-        if isinstance(raw, bool):
-            return raw
-        return _parse_bool(str(raw), bool(definition["default"]))
 
+def _compile_setting_parser(definition: dict[str, Any]) -> Callable[[Any], Any]:
+    setting_type = definition["type"]
+    if setting_type == "bool":
+        return partial(_parse_bool_setting, default=bool(definition["default"]))
     if setting_type == "int":
-        try:
-            parsed = int(raw)
-        except (TypeError, ValueError) as exc:
-            raise ValueError(f"{definition['label']} must be a valid integer.") from exc
+        min_value = definition.get("min")
+        max_value = definition.get("max")
+        return partial(
+            _parse_int_setting,
+            label=definition["label"],
+            min_value=None if min_value is None else int(min_value),
+            max_value=None if max_value is None else int(max_value),
+        )
+    return str
+
+
+# Parsers/serializers are resolved once per key so the settings hot paths
+# don't re-branch on the definition type for every value.
+_SETTING_PARSERS: dict[str, Callable[[Any], Any]] = {
+    key: _compile_setting_parser(definition) for key, definition in SETTING_DEFINITIONS.items()
+}
+_SETTING_SERIALIZERS: dict[str, Callable[[Any], str]] = {
+    key: _serialize_bool_setting if definition["type"] == "bool" else str
+    for key, definition in SETTING_DEFINITIONS.items()
+}
+
+
+def _serialize_setting_value(key: str, value: Any) -> str:
+    return _SETTING_SERIALIZERS[key](value)
 
-        min_value = int(definition.get("min", parsed))
-        max_value = int(definition.get("max", parsed))
-        if parsed < min_value or parsed > max_value:
-            raise ValueError(f"{definition['label']} must be between {min_value} and {max_value}.")
-        return parsed
 
-    return str(raw)
+def _parse_setting_value(key: str, raw: str | int | bool) -> Any:
+    return _SETTING_PARSERS[key](raw)
 
 
 store = MonitorStore(MONITOR_DB_PATH)
@@ -140,9 +179,11 @@ store = MonitorStore(MONITOR_DB_PATH)
 
 def _load_settings() -> dict[str, Any]:
     loaded: dict[str, Any] = {}
+    stored = store.get_all_settings()
+    changed: dict[str, str] = {}
     for key in SETTINGS_ORDER:
         default_value = _parse_setting_value(key, SETTING_DEFINITIONS[key]["default"])
-        raw_value = store.get_setting(key)
+        raw_value = stored.get(key)
         if raw_value is None:
             parsed_value = default_value
         else:
@@ -151,18 +192,26 @@ def _load_settings() -> dict[str, Any]:
             except ValueError:
                 parsed_value = default_value
         loaded[key] = parsed_value
-        store.set_setting(key, _serialize_setting_value(key, parsed_value))
+        serialized = _serialize_setting_value(key, parsed_value)
+        if serialized != raw_value:
+            changed[key] = serialized
+    store.set_settings_bulk(changed)
     return loaded
 
 
 settings_state = _load_settings()
-monitor = TikTokMonitorService(store, interval_seconds=int(settings_state["monitor_interval_seconds"]))
+monitor = TikTokMonitorService(
+    store,
+    interval_seconds=int(settings_state["monitor_interval_seconds"]),
+    retention_days=int(settings_state["history_retention_days"]),
+)
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", os.urandom(24))
 
 
 def _apply_runtime_settings() -> None:
     monitor.interval_seconds = int(settings_state["monitor_interval_seconds"])
+    monitor.retention_days = int(settings_state["history_retention_days"])
 
 
 def _get_setting_limit(name: str) -> int:
@@ -181,7 +230,68 @@ def _resolve_limit(limit_raw: str | None, default_limit: int, max_limit: int) ->
     return limit, None
 
 
+def _resolve_page(
+    limit_raw: str | None, cursor_raw: str | None, default_limit: int, max_limit: int
+) -> tuple[int | None, int | None, str | None]:
+    # limit is None exactly when an error message is returned.
+    limit, error = _resolve_limit(limit_raw, default_limit, max_limit)
+    if error:
+        return None, None, error
+    if not cursor_raw:
+        return limit, None, None
+    try:
+        cursor = int(cursor_raw)
+    except ValueError:
+        return None, None, "before_id must be an integer."
+    if cursor < 1:
+        return None, None, "before_id must be a positive integer."
+    return limit, cursor, None
+
+
+def _stream_json_page(rows: list[dict[str, Any]], limit: int) -> Iterator[bytes]:
+    # Rows arrive newest-first, so a full page's last id is the cursor for the next one.
+    yield b'{"items":['
+    separator = b""
+    count = 0
+    last_id = None
+    for row in rows:
+        yield separator + orjson.dumps(row)
+        separator = b","
+        count += 1
+        last_id = row["id"]
+    next_cursor = last_id if count == limit else None
+    yield b'],"next_cursor":' + orjson.dumps(next_cursor) + b"}"
+
+
+def _json_page_response(rows: Iterable[dict[str, Any]], limit: int) -> Response:
+    # Pages are capped at api_max_limit, so the whole page is read inside the view:
+    # database errors still surface as a 500, and the read connection is released
+    # before any bytes go to the client. Only the serialization is streamed.
+    return Response(_stream_json_page(list(rows), limit), mimetype="application/json")
+
+
+def _paged_api_response(
+    fetch_page: Callable[[int, int | None], Iterable[dict[str, Any]]], default_limit_setting: str
+) -> Any:
+    max_limit = _get_setting_limit("api_max_limit")
+    default_limit = min(_get_setting_limit(default_limit_setting), max_limit)
+    limit, before_id, error = _resolve_page(
+        request.args.get("limit"), request.args.get("before_id"), default_limit, max_limit
+    )
+    if limit is None:
+        return jsonify({"error": error}), 400
+    return _json_page_response(fetch_page(limit, before_id), limit)
+
+
+_settings_view_cache: list[dict[str, Any]] | None = None
+
+
 def _settings_view_model() -> list[dict[str, Any]]:
+    # Rows only change when settings are saved, so they're built once and reused.
+    global _settings_view_cache
+    if _settings_view_cache is not None:
+        return _settings_view_cache
+
     rows: list[dict[str, Any]] = []
     for key in SETTINGS_ORDER:
         definition = SETTING_DEFINITIONS[key]
@@ -197,14 +307,21 @@ def _settings_view_model() -> list[dict[str, Any]]:
                 "max": definition.get("max"),
             }
         )
+    _settings_view_cache = rows
     return rows
 
 
+def _invalidate_settings_view() -> None:
+    global _settings_view_cache
+    _settings_view_cache = None
+
+
 def _dashboard_context() -> dict[str, Any]:
     return {
-        "watchlist": store.list_watch_accounts_with_latest(),
-        "events": store.get_recent_events(limit=_get_setting_limit("dashboard_events_limit")),
-        "failures": store.get_recent_failures(limit=_get_setting_limit("dashboard_failures_limit")),
+        **store.get_dashboard_bundle(
+            events_limit=_get_setting_limit("dashboard_events_limit"),
+            failures_limit=_get_setting_limit("dashboard_failures_limit"),
+        ),
         "monitor_status": monitor.status(),
         "settings_rows": _settings_view_model(),
     }
@@ -217,9 +334,9 @@ def index():
     username = ""
     watch_username = ""
 
-    # Read flash from session (set by POST redirect)
-    status_message = session.pop("_flash_msg", None)
-    status_kind = session.pop("_flash_kind", "success")
+    # Read flash set by the POST redirect; the newest one wins, as before flashing.
+    flashed = get_flashed_messages(with_categories=True)
+    status_kind, status_message = flashed[-1] if flashed else ("success", None)
 
     if request.method == "POST":
         action = request.form.get("action", "").strip()
@@ -227,13 +344,14 @@ def index():
         if action == "save_settings":
             proposed: dict[str, Any] = {}
             errors: list[str] = []
+            form = request.form.to_dict(flat=True)
 
             for key in SETTINGS_ORDER:
                 definition = SETTING_DEFINITIONS[key]
                 if definition["type"] == "bool":
-                    raw_value: Any = request.form.get(key) == "1"
+                    raw_value: Any = form.get(key) == "1"
                 else:
-                    raw_value = request.form.get(key, "").strip()
+                    raw_value = form.get(key, "").strip()
                 try:
                     proposed[key] = _parse_setting_value(key, raw_value)
                 except ValueError as exc:
@@ -245,31 +363,32 @@ def index():
                 errors.append("History default limit cannot be greater than API max limit.")
 
             if errors:
-                session["_flash_msg"] = errors[0]
-                session["_flash_kind"] = "error"
+                flash(errors[0], "error")
             else:
                 restart_required_changes = []
+                changed: dict[str, str] = {}
                 for key, value in proposed.items():
-                    if settings_state[key] != value and bool(SETTING_DEFINITIONS[key].get("restart_required", False)):
+                    if settings_state[key] == value:
+                        continue
+                    if bool(SETTING_DEFINITIONS[key].get("restart_required", False)):
                         restart_required_changes.append(SETTING_DEFINITIONS[key]["label"])
                     settings_state[key] = value
-                    store.set_setting(key, _serialize_setting_value(key, value))
+                    changed[key] = _serialize_setting_value(key, value)
+                store.set_settings_bulk(changed)
                 _apply_runtime_settings()
+                _invalidate_settings_view()
                 msg = "Settings saved."
                 if restart_required_changes:
                     msg += " Restart required for: " + ", ".join(restart_required_changes) + "."
-                session["_flash_msg"] = msg
-                session["_flash_kind"] = "success"
+                flash(msg, "success")
             return redirect(url_for("index"))
 
         elif action == "reset_monitor_data":
             if monitor.is_running:
-                session["_flash_msg"] = "Stop the monitor before clearing data."
-                session["_flash_kind"] = "error"
+                flash("Stop the monitor before clearing data.", "error")
             else:
                 store.clear_monitor_data()
-                session["_flash_msg"] = "All watchlist/history/events/failures data cleared."
-                session["_flash_kind"] = "success"
+                flash("All watchlist/history/events/failures data cleared.", "success")
             return redirect(url_for("index"))
 
         elif action == "manual_check":
@@ -287,68 +406,55 @@ def index():
             try:
                 normalized = normalize_username(watch_username)
                 store.add_watch_account(normalized)
-                session["_flash_msg"] = f"@{normalized} added to watchlist."
-                session["_flash_kind"] = "success"
+                flash(f"@{normalized} added to watchlist.", "success")
             except TikTokScrapeError as exc:
-                session["_flash_msg"] = str(exc)
-                session["_flash_kind"] = "error"
+                flash(str(exc), "error")
             return redirect(url_for("index"))
 
         elif action == "remove_watch":
             watch_username = request.form.get("watch_username", "").strip().lstrip("@")
             if not watch_username:
-                session["_flash_msg"] = "Missing watchlist username."
-                session["_flash_kind"] = "error"
+                flash("Missing watchlist username.", "error")
             elif store.deactivate_watch_account(watch_username):
-                session["_flash_msg"] = f"@{watch_username} removed from watchlist."
-                session["_flash_kind"] = "success"
+                flash(f"@{watch_username} removed from watchlist.", "success")
             else:
-                session["_flash_msg"] = f"@{watch_username} is not in your active watchlist."
-                session["_flash_kind"] = "error"
+                flash(f"@{watch_username} is not in your active watchlist.", "error")
             return redirect(url_for("index"))
 
         elif action == "check_watch_now":
             watch_username = request.form.get("watch_username", "").strip().lstrip("@")
             if not watch_username:
-                session["_flash_msg"] = "Missing watchlist username."
-                session["_flash_kind"] = "error"
+                flash("Missing watchlist username.", "error")
             elif monitor.check_account(watch_username):
-                session["_flash_msg"] = f"Manual check completed for @{watch_username}."
-                session["_flash_kind"] = "success"
+                flash(f"Manual check completed for @{watch_username}.", "success")
             else:
-                session["_flash_msg"] = f"Manual check failed for @{watch_username}. See failures below."
-                session["_flash_kind"] = "error"
+                flash(f"Manual check failed for @{watch_username}. See failures below.", "error")
             return redirect(url_for("index"))
 
         elif action == "run_monitor_now":
             summary = monitor.run_once()
             if summary["status"] == "busy":
-                session["_flash_msg"] = "Iris monitor is already running a cycle."
-                session["_flash_kind"] = "error"
+                flash("Iris monitor is already running a cycle.", "error")
             else:
-                session["_flash_msg"] = (
+                flash(
                     f"Cycle complete: checked {summary['checked']}/{summary['accounts']} account(s), "
-                    f"failed {summary['failed']}."
+                    f"failed {summary['failed']}.",
+                    "success",
                 )
-                session["_flash_kind"] = "success"
             return redirect(url_for("index"))
 
         elif action == "start_monitor":
             if monitor.start():
-                session["_flash_msg"] = "Periodic Iris monitor started."
-                session["_flash_kind"] = "success"
+                flash("Periodic Iris monitor started.", "success")
             else:
-                session["_flash_msg"] = "Iris monitor is already running."
-                session["_flash_kind"] = "error"
+                flash("Iris monitor is already running.", "error")
             return redirect(url_for("index"))
 
         elif action == "stop_monitor":
             if monitor.stop():
-                session["_flash_msg"] = "Periodic Iris monitor stopped."
-                session["_flash_kind"] = "success"
+                flash("Periodic Iris monitor stopped.", "success")
             else:
-                session["_flash_msg"] = "Iris monitor is not running."
-                session["_flash_kind"] = "error"
+                flash("Iris monitor is not running.", "error")
             return redirect(url_for("index"))
 
         # unknown or empty action — just fall through to GET render
@@ -384,22 +490,18 @@ def api_watchlist():
 
 @app.get("/api/events")
 def api_events():
-    max_limit = _get_setting_limit("api_max_limit")
-    default_limit = min(_get_setting_limit("api_default_limit"), max_limit)
-    limit, error = _resolve_limit(request.args.get("limit"), default_limit, max_limit)
-    if error:
-        return jsonify({"error": error}), 400
-    return jsonify(store.get_recent_events(limit=limit or default_limit))
+    return _paged_api_response(
+        lambda limit, before_id: store.iter_recent_events(limit=limit, before_id=before_id),
+        "api_default_limit",
+    )
 
 
 @app.get("/api/failures")
 def api_failures():
-    max_limit = _get_setting_limit("api_max_limit")
-    default_limit = min(_get_setting_limit("api_default_limit"), max_limit)
-    limit, error = _resolve_limit(request.args.get("limit"), default_limit, max_limit)
-    if error:
-        return jsonify({"error": error}), 400
-    return jsonify(store.get_recent_failures(limit=limit or default_limit))
+    return _paged_api_response(
+        lambda limit, before_id: store.iter_recent_failures(limit=limit, before_id=before_id),
+        "api_default_limit",
+    )
 
 
 @app.get("/api/history/<username>")
@@ -409,12 +511,10 @@ def api_history(username: str):
     except TikTokScrapeError as exc:
         return jsonify({"error": str(exc)}), 400
 
-    max_limit = _get_setting_limit("api_max_limit")
-    default_limit = min(_get_setting_limit("history_default_limit"), max_limit)
-    limit, error = _resolve_limit(request.args.get("limit"), default_limit, max_limit)
-    if error:
-        return jsonify({"error": error}), 400
-    return jsonify(store.get_snapshots(normalized, limit=limit or default_limit))
+    return _paged_api_response(
+        lambda limit, before_id: store.iter_snapshots(normalized, limit=limit, before_id=before_id),
+        "history_default_limit",
+    )
 
 
 if __name__ == "__main__":
@@ -422,6 +522,10 @@ if __name__ == "__main__":
     app_port = int(settings_state["app_port"])
     auto_start = bool(settings_state["auto_start_monitor"])
 
-    if auto_start and (not debug_mode or os.environ.get("WERKZEUG_RUN_MAIN") == "true"):
-        monitor.start()
+    if not debug_mode or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        # Load scrapling in the background so the first manual check doesn't pay
+        # for the import, even if the monitor is off or has nothing to check.
+        Thread(target=warm_up, name="scraper-warm-up", daemon=True).start()
+        if auto_start:
+            monitor.start()
     app.run(debug=debug_mode, port=app_port)
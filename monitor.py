@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Event, Lock, Thread
-from typing import Any
+from typing import Any, Final
 
 from scraper import TikTokScrapeError, fetch_tiktok_profile
 from storage import MonitorStore, utc_now_iso
 
-NUMERIC_FIELDS = ("followers", "following", "likes", "videos_count")
-TEXT_FIELDS = ("nickname", "bio")
-BOOLEAN_FIELDS = ("verified",)
+NUMERIC_FIELDS: Final[tuple[str, ...]] = ("followers", "following", "likes", "videos_count")
+TEXT_FIELDS: Final[tuple[str, ...]] = ("nickname", "bio")
+BOOLEAN_FIELDS: Final[tuple[str, ...]] = ("verified",)
 
 
 def _as_int(value: Any) -> int | None:
@@ -28,10 +30,18 @@ def detect_profile_changes(
         return []
 
     events: list[dict[str, Any]] = []
+    previous_get = previous.get
+    current_get = current.get
 
     for field in NUMERIC_FIELDS:
-        old_value = _as_int(previous.get(field))
-        new_value = _as_int(current.get(field))
+        # Snapshot values are normally ints already; only fall back to the
+        # coercing helper for anything else.
+        old_value = previous_get(field)
+        if type(old_value) is not int:
+            old_value = _as_int(old_value)
+        new_value = current_get(field)
+        if type(new_value) is not int:
+            new_value = _as_int(new_value)
         if old_value is None or new_value is None or old_value == new_value:
             continue
         delta = new_value - old_value
@@ -46,8 +56,8 @@ def detect_profile_changes(
         )
 
     for field in TEXT_FIELDS:
-        old_value = previous.get(field)
-        new_value = current.get(field)
+        old_value = previous_get(field)
+        new_value = current_get(field)
         if old_value == new_value:
             continue
         events.append(
@@ -61,8 +71,8 @@ def detect_profile_changes(
         )
 
     for field in BOOLEAN_FIELDS:
-        old_value = bool(previous.get(field))
-        new_value = bool(current.get(field))
+        old_value = bool(previous_get(field))
+        new_value = bool(current_get(field))
         if old_value == new_value:
             continue
         events.append(
@@ -79,9 +89,18 @@ def detect_profile_changes(
 
 
 class TikTokMonitorService:
-    def __init__(self, store: MonitorStore, interval_seconds: int = 900) -> None:
+    def __init__(
+        self,
+        store: MonitorStore,
+        interval_seconds: int = 900,
+        max_workers: int = 4,
+        retention_days: int = 0,
+    ) -> None:
         self.store = store
         self.interval_seconds = interval_seconds
+        self.max_workers = max_workers
+        # History older than this is purged after each cycle; 0 keeps everything.
+        self.retention_days = retention_days
         self._stop_event = Event()
         self._run_lock = Lock()
         self._thread: Thread | None = None
@@ -119,9 +138,18 @@ class TikTokMonitorService:
         return True
 
     def _run_loop(self) -> None:
+        # Cycles are scheduled against a monotonic deadline so the period stays
+        # at interval_seconds however long each cycle takes. If a cycle overruns
+        # the next one starts immediately and the schedule restarts from now.
+        next_run = time.monotonic()
         while not self._stop_event.is_set():
             self.run_once()
-            self._stop_event.wait(self.interval_seconds)
+            next_run += self.interval_seconds
+            delay = next_run - time.monotonic()
+            if delay <= 0:
+                delay = 0.0
+                next_run = time.monotonic()
+            self._stop_event.wait(delay)
 
     def run_once(self) -> dict[str, Any]:
         if not self._run_lock.acquire(blocking=False):
@@ -133,12 +161,27 @@ class TikTokMonitorService:
             checked = 0
             failed = 0
 
-            for account in accounts:
-                ok = self.check_account(account["username"])
-                if ok:
-                    checked += 1
-                else:
-                    failed += 1
+            if accounts:
+                # Fetches are network-bound and independent, so run them concurrently
+                # and then store every successful result in one transaction.
+                results: list[tuple[str, dict[str, Any]]] = []
+                workers = max(1, min(self.max_workers, len(accounts)))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tiktok-check") as pool:
+                    futures = {
+                        pool.submit(self._fetch_profile, account["username"]): account["username"]
+                        for account in accounts
+                    }
+                    for future in as_completed(futures):
+                        current = future.result()
+                        if current is None:
+                            failed += 1
+                        else:
+                            results.append((futures[future], current))
+                self._record_checks(results)
+                checked = len(results)
+
+            if self.retention_days > 0:
+                self.store.purge_older_than(self.retention_days)
 
             summary = {
                 "status": "ok",
@@ -152,18 +195,31 @@ class TikTokMonitorService:
             self.last_run_finished_at = utc_now_iso()
             self._run_lock.release()
 
-    def check_account(self, username: str) -> bool:
-        previous = self.store.get_latest_snapshot(username)
+    def _fetch_profile(self, username: str) -> dict[str, Any] | None:
         try:
-            current = fetch_tiktok_profile(username)
+            return fetch_tiktok_profile(username)
         except TikTokScrapeError as exc:
             self.store.record_failure(username, str(exc))
-            return False
+            return None
         except Exception as exc:  # Keep monitor cycle alive while recording explicit failures.
             self.store.record_failure(username, f"{exc.__class__.__name__}: {exc}")
-            return False
+            return None
+
+    def _record_checks(self, results: list[tuple[str, dict[str, Any]]]) -> None:
+        if not results:
+            return
+        # Fetches happen before the transaction so no write lock is held
+        # across network round-trips.
+        with self.store.txn():
+            previous = {username: self.store.get_latest_snapshot(username) for username, _ in results}
+            self.store.save_snapshots_bulk([current for _, current in results])
+            for username, current in results:
+                events = detect_profile_changes(previous[username], current)
+                self.store.record_events(current["username"], events)
 
-        self.store.save_snapshot(current)
-        events = detect_profile_changes(previous, current)
-        self.store.record_events(current["username"], events)
+    def check_account(self, username: str) -> bool:
+        current = self._fetch_profile(username)
+        if current is None:
+            return False
+        self._record_checks([(username, current)])
         return True
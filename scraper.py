@@ -1,101 +1,176 @@
 from __future__ import annotations
 
-import json
 import re
+from contextlib import contextmanager
+from queue import Empty, Full, Queue
 from typing import Any, Iterator
 
-from scrapling.fetchers import Fetcher
+import orjson
+
+_USERNAME_RE = re.compile(r"[A-Za-z0-9._]{2,24}")
+
+_PAYLOAD_SCRIPT_IDS = ("__UNIVERSAL_DATA_FOR_REHYDRATION__", "SIGI_STATE", "__NEXT_DATA__")
+_PAYLOAD_SCRIPTS_XPATH = "//script[" + " or ".join(f'@id="{script_id}"' for script_id in _PAYLOAD_SCRIPT_IDS) + "]"
+
+# Open fetcher sessions kept alive between requests so connections (and their
+# TLS handshakes) are reused. Sessions aren't thread-safe, so each caller
+# borrows one exclusively. Entries are (FetcherSession, entered session) pairs
+# so a session can be closed when it fails or the pool is already full.
+_SESSION_POOL_SIZE = 4
+_SESSION_POOL: Queue[tuple[Any, Any]] = Queue(maxsize=_SESSION_POOL_SIZE)
+
+# scrapling pulls in its whole HTTP/browser stack on import, so it is loaded on
+# first use rather than whenever the app (or just its API routes) boots.
+_fetcher_session_cls: Any = None
 
 
 class TikTokScrapeError(Exception):
     """Raised when TikTok profile data cannot be extracted."""
 
 
-def _walk(node: Any) -> Iterator[dict[str, Any]]:
-    if isinstance(node, dict):
-        yield node
-        for value in node.values():
-            yield from _walk(value)
-    elif isinstance(node, list):
-        for item in node:
-            yield from _walk(item)
+def _get_fetcher_session_cls() -> Any:
+    global _fetcher_session_cls
+    if _fetcher_session_cls is None:
+        from scrapling.fetchers import FetcherSession
+
+        _fetcher_session_cls = FetcherSession
+    return _fetcher_session_cls
+
+
+def warm_up() -> None:
+    """Load the fetcher backend ahead of the first scrape."""
+    _get_fetcher_session_cls()
+
+
+@contextmanager
+def _pooled_session() -> Iterator[Any]:
+    try:
+        fetcher, session = _SESSION_POOL.get_nowait()
+    except Empty:
+        fetcher = _get_fetcher_session_cls()()
+        session = fetcher.__enter__()
+    try:
+        yield session
+    except BaseException:
+        # The failed request may have left the session's connection broken.
+        fetcher.__exit__(None, None, None)
+        raise
+    try:
+        _SESSION_POOL.put_nowait((fetcher, session))
+    except Full:
+        fetcher.__exit__(None, None, None)
+
+
+def _walk_dicts(root: Any) -> Iterator[dict[str, Any]]:
+    # Explicit stack instead of recursive generators; children are pushed in
+    # reverse so dicts are still yielded in document (pre-)order.
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(reversed(node.values()))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
 
 
 def _extract_payload(page: Any) -> dict[str, Any]:
-    selectors = (
-        "script#__UNIVERSAL_DATA_FOR_REHYDRATION__::text",
-        "script#SIGI_STATE::text",
-        "script#__NEXT_DATA__::text",
-    )
-    for selector in selectors:
-        raw_payload = page.css(selector).get()
+    # One query collects every candidate script; they're then tried in priority order.
+    scripts: dict[str, str] = {}
+    for node in page.xpath(_PAYLOAD_SCRIPTS_XPATH):
+        scripts.setdefault(str(node.attrib.get("id")), str(node.text))
+    for script_id in _PAYLOAD_SCRIPT_IDS:
+        raw_payload = scripts.get(script_id)
         if not raw_payload:
             continue
         try:
-            loaded = json.loads(raw_payload)
-        except json.JSONDecodeError:
+            loaded = orjson.loads(raw_payload)
+        except orjson.JSONDecodeError:
             continue
         if isinstance(loaded, dict):
             return loaded
     raise TikTokScrapeError("Could not read TikTok profile payload from page.")
 
 
-def _extract_user_and_stats(payload: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
-    for candidate in _walk(payload):
-        user_info = candidate.get("userInfo")
-        if isinstance(user_info, dict):
-            user = user_info.get("user", {})
-            stats = user_info.get("stats", {})
-            if isinstance(user, dict) and user.get("uniqueId"):
-                return user, stats if isinstance(stats, dict) else {}
-
-        user = candidate.get("user")
+def _match_user_and_stats(candidate: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]] | None:
+    # The flat user/stats shape is checked first: most nodes fail it on a
+    # single lookup, so the nested userInfo lookups are rarely reached.
+    user = candidate.get("user")
+    if isinstance(user, dict) and user.get("uniqueId"):
         stats = candidate.get("stats")
-        if isinstance(user, dict) and user.get("uniqueId") and isinstance(stats, dict):
+        if isinstance(stats, dict):
             return user, stats
 
-    raise TikTokScrapeError("Could not find TikTok account details in payload.")
-
-
-def _extract_recent_videos(payload: dict[str, Any], limit: int = 8) -> list[dict[str, Any]]:
-    for candidate in _walk(payload):
-        item_module = candidate.get("itemModule")
-        if not isinstance(item_module, dict) or not item_module:
+    user_info = candidate.get("userInfo")
+    if isinstance(user_info, dict):
+        user = user_info.get("user", {})
+        stats = user_info.get("stats", {})
+        if isinstance(user, dict) and user.get("uniqueId"):
+            return user, stats if isinstance(stats, dict) else {}
+    return None
+
+
+def _match_recent_videos(candidate: dict[str, Any], limit: int) -> list[dict[str, Any]]:
+    item_module = candidate.get("itemModule")
+    if not isinstance(item_module, dict) or not item_module:
+        return []
+    videos: list[dict[str, Any]] = []
+    for item in item_module.values():
+        if not isinstance(item, dict):
             continue
-        videos: list[dict[str, Any]] = []
-        for item in item_module.values():
-            if not isinstance(item, dict):
-                continue
-            stats = item.get("stats", {})
-            if not isinstance(stats, dict):
-                stats = {}
-            videos.append(
-                {
-                    "id": item.get("id"),
-                    "description": item.get("desc", ""),
-                    "play_count": stats.get("playCount"),
-                    "digg_count": stats.get("diggCount"),
-                    "comment_count": stats.get("commentCount"),
-                    "share_count": stats.get("shareCount"),
-                }
-            )
-        if videos:
-            return videos[:limit]
-    return []
+        stats = item.get("stats")
+        if not isinstance(stats, dict):
+            stats = {}
+        videos.append(
+            {
+                "id": item.get("id"),
+                "description": item.get("desc", ""),
+                "play_count": stats.get("playCount"),
+                "digg_count": stats.get("diggCount"),
+                "comment_count": stats.get("commentCount"),
+                "share_count": stats.get("shareCount"),
+            }
+        )
+        if len(videos) >= limit:
+            break
+    return videos
+
+
+def _extract_all(
+    payload: dict[str, Any], video_limit: int = 8
+) -> tuple[dict[str, Any], dict[str, Any], list[dict[str, Any]]]:
+    """Find account details and recent videos in a single walk of the payload."""
+    user_and_stats: tuple[dict[str, Any], dict[str, Any]] | None = None
+    videos: list[dict[str, Any]] = []
+    for candidate in _walk_dicts(payload):
+        # Key membership is checked inline so the matchers only run for the
+        # few nodes that can possibly match.
+        if user_and_stats is None and ("user" in candidate or "userInfo" in candidate):
+            user_and_stats = _match_user_and_stats(candidate)
+        if not videos and "itemModule" in candidate:
+            videos = _match_recent_videos(candidate, video_limit)
+        if user_and_stats is not None and videos:
+            break
+
+    if user_and_stats is None:
+        raise TikTokScrapeError("Could not find TikTok account details in payload.")
+    user, stats = user_and_stats
+    return user, stats, videos
 
 
 def normalize_username(username: str) -> str:
     normalized = username.strip().lstrip("@").lower()
-    if not re.fullmatch(r"[A-Za-z0-9._]{2,24}", normalized):
+    if not _USERNAME_RE.fullmatch(normalized):
         raise TikTokScrapeError("Please enter a valid TikTok username.")
     return normalized
 
 
 def fetch_tiktok_profile(username: str) -> dict[str, Any]:
     normalized = normalize_username(username)
-    page = Fetcher.get(f"https://www.tiktok.com/@{normalized}")
+    with _pooled_session() as session:
+        page = session.get(f"https://www.tiktok.com/@{normalized}")
     payload = _extract_payload(page)
-    user, stats = _extract_user_and_stats(payload)
+    user, stats, recent_videos = _extract_all(payload)
 
     return {
         "username": user.get("uniqueId", normalized),
@@ -107,5 +182,5 @@ def fetch_tiktok_profile(username: str) -> dict[str, Any]:
         "likes": stats.get("heartCount"),
         "videos_count": stats.get("videoCount"),
         "profile_url": f"https://www.tiktok.com/@{normalized}",
-        "recent_videos": _extract_recent_videos(payload),
+        "recent_videos": recent_videos,
     }
@@ -1,20 +1,206 @@
 from __future__ import annotations
 
 import sqlite3
-from datetime import datetime, timezone
+import time
+from contextlib import closing, contextmanager
+from functools import wraps
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from queue import Empty, Queue
+from threading import Lock, local
+from typing import Any, Callable, Iterator, TypeVar
+
+_T = TypeVar("_T")
+
+# Dashboard/API reads are served from memory for this long; any write clears them.
+READ_CACHE_TTL_SECONDS = 2.0
+READ_CACHE_MAX_ENTRIES = 64
+STREAM_BATCH_SIZE = 512
+STATEMENT_CACHE_SIZE = 256
+# query_only connections kept open for reuse by reading threads. Reads never wait
+# for one: when all are busy a temporary connection is opened and closed after use.
+READ_POOL_SIZE = 4
+# Stays below SQLite's historical default limit of 999 bound parameters.
+SQL_VARIABLES_PER_STATEMENT = 500
+
+# Applied to every new connection. WAL (set once per store) plus synchronous=NORMAL
+# keeps commits from fsyncing the main database file each time.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA journal_size_limit=6144000",
+    "PRAGMA secure_delete=OFF",
+)
+
+# Role-specific pragmas. The page cache is per connection, so one 64 MiB budget
+# is split: half for the writer (which also runs PRAGMA optimize), the rest
+# across the READ_POOL_SIZE pooled readers.
+WRITE_CONNECTION_PRAGMAS = (
+    "PRAGMA cache_size=-32768",
+    "PRAGMA analysis_limit=1000",
+)
+READ_CONNECTION_PRAGMAS = (
+    "PRAGMA query_only=1",
+    f"PRAGMA cache_size=-{32768 // READ_POOL_SIZE}",
+)
+
+# Only takes effect on a database with no pages yet; WAL fixes the page size after that.
+PAGE_SIZE = 8192
+
+# Rows purge_older_than() may delete from each history table, given the cutoff.
+# Each account's latest snapshot is always kept: it backs the dashboard's last
+# known stats and is the baseline change detection compares the next check to.
+# Each chunk is its own short transaction so the WAL stays small.
+PURGE_CONDITIONS = {
+    "snapshots": "checked_at < ? AND id NOT IN (SELECT MAX(id) FROM snapshots GROUP BY username)",
+    "events": "detected_at < ?",
+    "failures": "checked_at < ?",
+}
+PURGE_BATCH_SIZE = 1000
+
+# How often writers refresh planner statistics via PRAGMA optimize.
+OPTIMIZE_INTERVAL_SECONDS = 900.0
+
+
+SCHEMA_VERSION = 3
+
+# Timestamps are stored as integer Unix seconds and formatted back to ISO-8601
+# in the SELECTs below, so callers see the same strings as before.
+TABLE_DEFINITIONS = {
+    "watch_accounts": """
+        CREATE TABLE IF NOT EXISTS watch_accounts (
+            username TEXT PRIMARY KEY,
+            created_at INTEGER NOT NULL,
+            active INTEGER NOT NULL DEFAULT 1,
+            last_checked_at INTEGER,
+            last_error TEXT
+        )
+    """,
+    "snapshots": """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            checked_at INTEGER NOT NULL,
+            nickname TEXT,
+            bio TEXT,
+            verified INTEGER NOT NULL DEFAULT 0,
+            followers INTEGER,
+            following INTEGER,
+            likes INTEGER,
+            videos_count INTEGER,
+            profile_url TEXT NOT NULL
+        )
+    """,
+    "events": """
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            detected_at INTEGER NOT NULL,
+            metric TEXT NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            delta INTEGER,
+            message TEXT NOT NULL
+        )
+    """,
+    "failures": """
+        CREATE TABLE IF NOT EXISTS failures (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            checked_at INTEGER NOT NULL,
+            error TEXT NOT NULL
+        )
+    """,
+    "settings": """
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at INTEGER NOT NULL
+        )
+    """,
+}
+
+INDEX_DEFINITIONS = (
+    "CREATE INDEX IF NOT EXISTS idx_snapshots_username_id ON snapshots (username, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_events_detected ON events (detected_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_failures_checked ON failures (checked_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_snapshots_checked ON snapshots (checked_at)",
+)
+
+# Indexes no query uses any more; dropped so writes stop maintaining them.
+OBSOLETE_INDEXES = ("idx_snapshots_username_checked",)
+
+# ISO-8601 (UTC, whole seconds) form in which all timestamps are returned.
+ISO_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S+00:00"
+
+EPOCH_COLUMNS = {
+    "watch_accounts": ("created_at", "last_checked_at"),
+    "snapshots": ("checked_at",),
+    "events": ("detected_at",),
+    "failures": ("checked_at",),
+    "settings": ("updated_at",),
+}
+
+
+# Result columns of each SELECT, in projection order. Keep these in step with
+# the queries that use them.
+WATCH_ACCOUNT_COLUMNS = ("username", "created_at", "active", "last_checked_at", "last_error")
+WATCH_ACCOUNT_LATEST_COLUMNS = WATCH_ACCOUNT_COLUMNS + (
+    "snapshot_checked_at",
+    "nickname",
+    "followers",
+    "following",
+    "likes",
+    "videos_count",
+)
+SNAPSHOT_COLUMNS = (
+    "username",
+    "checked_at",
+    "nickname",
+    "bio",
+    "verified",
+    "followers",
+    "following",
+    "likes",
+    "videos_count",
+    "profile_url",
+)
+SNAPSHOT_PAGE_COLUMNS = ("id",) + SNAPSHOT_COLUMNS
+EVENT_COLUMNS = (
+    "id",
+    "username",
+    "detected_at",
+    "metric",
+    "old_value",
+    "new_value",
+    "delta",
+    "message",
+)
+FAILURE_COLUMNS = ("id", "username", "checked_at", "error")
 
 
 def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    # Same output as datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+    # without building datetime objects.
+    return time.strftime(ISO_TIMESTAMP_FORMAT, time.gmtime())
+
+
+def _iso(column: str) -> str:
+    # SQL expression rendering an epoch-seconds column like utc_now_iso().
+    return f"strftime('{ISO_TIMESTAMP_FORMAT}', {column}, 'unixepoch')"
 
 
-def _row_to_dict(row: sqlite3.Row) -> dict[str, Any]:
-    return {key: row[key] for key in row.keys()}
+def _rows_to_dicts(rows: list[tuple[Any, ...]], columns: tuple[str, ...]) -> list[dict[str, Any]]:
+    # Rows are plain tuples; columns is the matching *_COLUMNS constant below.
+    return [dict(zip(columns, row)) for row in rows]
 
 
 def _to_int(value: Any) -> int | None:
+    # Scraped counters are almost always ints already; skip the try/except for them.
+    if type(value) is int:
+        return value
     if value is None:
         return None
     try:
@@ -23,86 +209,217 @@ def _to_int(value: Any) -> int | None:
         return None
 
 
+def _cached_read(method: Callable[..., _T]) -> Callable[..., _T]:
+    @wraps(method)
+    def wrapper(self: MonitorStore, *args: Any, **kwargs: Any) -> _T:
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with self._read_cache_lock:
+            hit = self._read_cache.get(key)
+            generation = self._read_cache_generation
+        if hit is not None and hit[0] > now:
+            return hit[1]
+
+        value = method(self, *args, **kwargs)
+        with self._read_cache_lock:
+            # Don't cache a result that a concurrent write may already have made stale.
+            if generation == self._read_cache_generation:
+                if len(self._read_cache) >= READ_CACHE_MAX_ENTRIES:
+                    self._read_cache.clear()
+                self._read_cache[key] = (now + READ_CACHE_TTL_SECONDS, value)
+        return value
+
+    return wrapper
+
+
 class MonitorStore:
     def __init__(self, db_path: str | Path = "iris.db") -> None:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._read_cache: dict[tuple[Any, ...], tuple[float, Any]] = {}
+        self._read_cache_generation = 0
+        self._read_cache_lock = Lock()
+        self._local = local()
+        self._last_optimize = time.monotonic()
+        # All writes share one connection, serialized by _write_lock. Reads borrow a
+        # query_only connection from a small pool, so under WAL they never wait on it
+        # and request threads reuse connections instead of opening their own.
+        self._read_pool: Queue[sqlite3.Connection] = Queue(maxsize=READ_POOL_SIZE)
+        self._read_pool_lock = Lock()
+        self._read_conns_opened = 0
+        self._write_lock = Lock()
+        self._write_conn = self._connect(check_same_thread=False)
+        for pragma in WRITE_CONNECTION_PRAGMAS:
+            self._write_conn.execute(pragma)
         self._initialize()
-
-    def _connect(self) -> sqlite3.Connection:
-        connection = sqlite3.connect(self.db_path)
-        connection.row_factory = sqlite3.Row
-        self._ensure_schema(connection)
+        # Runs once the schema and any migration are in place, so there is
+        # something for it to analyze.
+        self._write_conn.execute("PRAGMA optimize")
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly by _transaction()/txn().
+        # The statement cache is sized above the number of distinct queries in this
+        # module so every prepared statement stays compiled on its connection.
+        connection = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            check_same_thread=check_same_thread,
+        )
+        for pragma in CONNECTION_PRAGMAS:
+            connection.execute(pragma)
         return connection
 
+    @contextmanager
+    def _pooled_reader(self) -> Iterator[sqlite3.Connection]:
+        pooled = True
+        try:
+            conn = self._read_pool.get_nowait()
+        except Empty:
+            with self._read_pool_lock:
+                pooled = self._read_conns_opened < READ_POOL_SIZE
+                if pooled:
+                    self._read_conns_opened += 1
+            try:
+                conn = self._connect(check_same_thread=False)
+                for pragma in READ_CONNECTION_PRAGMAS:
+                    conn.execute(pragma)
+            except BaseException:
+                if pooled:
+                    with self._read_pool_lock:
+                        self._read_conns_opened -= 1
+                raise
+        try:
+            yield conn
+        finally:
+            if pooled:
+                self._read_pool.put(conn)
+            else:
+                conn.close()
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        # Reads inside txn() go through the write connection so they see the
+        # transaction's own uncommitted changes; reads inside _read_snapshot()
+        # share its connection.
+        if getattr(self._local, "in_txn", False):
+            yield self._write_conn
+            return
+        conn: sqlite3.Connection | None = getattr(self._local, "read_conn", None)
+        if conn is not None:
+            yield conn
+            return
+        with self._pooled_reader() as conn:
+            yield conn
+
+    @contextmanager
+    def _read_snapshot(self) -> Iterator[None]:
+        # Holds one read transaction open so several queries see the same snapshot.
+        if getattr(self._local, "in_txn", False) or getattr(self._local, "read_conn", None):
+            yield
+            return
+        with self._pooled_reader() as conn:
+            conn.execute("BEGIN DEFERRED")
+            self._local.read_conn = conn
+            try:
+                yield
+            finally:
+                self._local.read_conn = None
+                conn.commit()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._write_conn
+        # Inside txn() every statement joins the caller's open transaction.
+        if getattr(self._local, "in_txn", False):
+            yield conn
+            return
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    @contextmanager
+    def txn(self) -> Iterator[None]:
+        """Run every store call in the block as one transaction on this thread."""
+        if getattr(self._local, "in_txn", False):
+            yield
+            return
+        with self._transaction():
+            self._local.in_txn = True
+            try:
+                yield
+            finally:
+                self._local.in_txn = False
+        # Clear again after commit so no reader cached the pre-commit state.
+        self._invalidate_read_cache()
+        self.maybe_optimize()
+
+    def maybe_optimize(self) -> None:
+        """Refresh planner statistics if OPTIMIZE_INTERVAL_SECONDS have passed."""
+        if getattr(self._local, "in_txn", False):
+            return
+        now = time.monotonic()
+        if now - self._last_optimize < OPTIMIZE_INTERVAL_SECONDS:
+            return
+        self._last_optimize = now
+        with self._write_lock:
+            self._write_conn.execute("PRAGMA optimize")
+
+    def _invalidate_read_cache(self) -> None:
+        with self._read_cache_lock:
+            self._read_cache.clear()
+            self._read_cache_generation += 1
+
     def _initialize(self) -> None:
-        # Force a first successful schema setup at startup.
-        with self._connect():
-            pass
+        # Schema setup and the persistent journal mode only need to run once per store.
+        conn = self._write_conn
+        # Larger pages keep the snapshots btree shallower for its wide bio/URL rows.
+        if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+            conn.execute(f"PRAGMA page_size={PAGE_SIZE}")
+        conn.execute("PRAGMA journal_mode=WAL")
+        # A database already stamped with this version has every table and index;
+        # schema changes must bump SCHEMA_VERSION so they get applied here.
+        if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+            return
+        with self._transaction():
+            self._migrate_epoch_timestamps(conn)
+        self._ensure_schema(conn)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
     def _ensure_schema(self, conn: sqlite3.Connection) -> None:
-        conn.executescript(
-            """
-            CREATE TABLE IF NOT EXISTS watch_accounts (
-                username TEXT PRIMARY KEY,
-                created_at TEXT NOT NULL,
-                active INTEGER NOT NULL DEFAULT 1,
-                last_checked_at TEXT,
-                last_error TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS snapshots (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL,
-                checked_at TEXT NOT NULL,
-                nickname TEXT,
-                bio TEXT,
-                verified INTEGER NOT NULL DEFAULT 0,
-                followers INTEGER,
-                following INTEGER,
-                likes INTEGER,
-                videos_count INTEGER,
-                profile_url TEXT NOT NULL
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_snapshots_username_checked
-                ON snapshots (username, checked_at DESC);
-
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL,
-                detected_at TEXT NOT NULL,
-                metric TEXT NOT NULL,
-                old_value TEXT,
-                new_value TEXT,
-                delta INTEGER,
-                message TEXT NOT NULL
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_events_detected
-                ON events (detected_at DESC);
-
-            CREATE TABLE IF NOT EXISTS failures (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL,
-                checked_at TEXT NOT NULL,
-                error TEXT NOT NULL
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_failures_checked
-                ON failures (checked_at DESC);
-
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            );
-            """
-        )
+        drops = [f"DROP INDEX IF EXISTS {name}" for name in OBSOLETE_INDEXES]
+        conn.executescript(";\n".join((*TABLE_DEFINITIONS.values(), *INDEX_DEFINITIONS, *drops)) + ";")
+
+    def _migrate_epoch_timestamps(self, conn: sqlite3.Connection) -> None:
+        # Databases created before timestamps became epoch integers store them as
+        # ISO-8601 TEXT. TEXT affinity would turn new integers back into strings,
+        # so each such table is rebuilt with the current definition and its
+        # values converted in place.
+        for table, timestamp_columns in EPOCH_COLUMNS.items():
+            column_types = {row[1]: str(row[2]).upper() for row in conn.execute(f"PRAGMA table_info({table})")}
+            if not column_types or all(column_types.get(column) == "INTEGER" for column in timestamp_columns):
+                continue
+            columns = list(column_types)
+            select_list = ", ".join(
+                f"CAST(strftime('%s', {column}) AS INTEGER)" if column in timestamp_columns else column
+                for column in columns
+            )
+            conn.execute(f"ALTER TABLE {table} RENAME TO {table}_text_timestamps")
+            conn.execute(TABLE_DEFINITIONS[table])
+            conn.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"SELECT {select_list} FROM {table}_text_timestamps"
+            )
+            conn.execute(f"DROP TABLE {table}_text_timestamps")
 
     def add_watch_account(self, username: str) -> None:
-        now = utc_now_iso()
-        with self._connect() as conn:
+        now = int(time.time())
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO watch_accounts (username, created_at, active)
@@ -111,18 +428,25 @@ class MonitorStore:
                 """,
                 (username, now),
             )
+        self._invalidate_read_cache()
 
     def deactivate_watch_account(self, username: str) -> bool:
-        with self._connect() as conn:
+        with self._transaction() as conn:
             cursor = conn.execute(
                 "UPDATE watch_accounts SET active = 0 WHERE username = ?",
                 (username,),
             )
+        self._invalidate_read_cache()
         return cursor.rowcount > 0
 
     def list_watch_accounts(self, active_only: bool = True) -> list[dict[str, Any]]:
-        query = """
-            SELECT username, created_at, active, last_checked_at, last_error
+        query = f"""
+            SELECT
+                username,
+                {_iso("created_at")} AS created_at,
+                active,
+                {_iso("last_checked_at")} AS last_checked_at,
+                last_error
             FROM watch_accounts
         """
         params: tuple[Any, ...] = ()
@@ -130,21 +454,24 @@ class MonitorStore:
             query += " WHERE active = 1"
         query += " ORDER BY username COLLATE NOCASE ASC"
 
-        with self._connect() as conn:
-            rows = conn.execute(query, params).fetchall()
-        return [_row_to_dict(row) for row in rows]
+        with self._reader() as conn:
+            return _rows_to_dicts(conn.execute(query, params).fetchall(), WATCH_ACCOUNT_COLUMNS)
 
+    @_cached_read
     def list_watch_accounts_with_latest(self) -> list[dict[str, Any]]:
-        with self._connect() as conn:
+        return self._select_watch_accounts_with_latest()
+
+    def _select_watch_accounts_with_latest(self) -> list[dict[str, Any]]:
+        with self._reader() as conn:
             rows = conn.execute(
-                """
+                f"""
                 SELECT
                     w.username,
-                    w.created_at,
+                    {_iso("w.created_at")} AS created_at,
                     w.active,
-                    w.last_checked_at,
+                    {_iso("w.last_checked_at")} AS last_checked_at,
                     w.last_error,
-                    s.checked_at AS snapshot_checked_at,
+                    {_iso("s.checked_at")} AS snapshot_checked_at,
                     s.nickname,
                     s.followers,
                     s.following,
@@ -153,23 +480,33 @@ class MonitorStore:
                 FROM watch_accounts w
                 LEFT JOIN snapshots s
                     ON s.id = (
-                        SELECT id
+                        SELECT MAX(id)
                         FROM snapshots
                         WHERE username = w.username
-                        ORDER BY id DESC
-                        LIMIT 1
                     )
                 WHERE w.active = 1
                 ORDER BY w.username COLLATE NOCASE ASC
                 """
             ).fetchall()
-        return [_row_to_dict(row) for row in rows]
+            return _rows_to_dicts(rows, WATCH_ACCOUNT_LATEST_COLUMNS)
+
+    @_cached_read
+    def get_dashboard_bundle(self, events_limit: int = 50, failures_limit: int = 25) -> dict[str, Any]:
+        """Watchlist, recent events and recent failures read from one snapshot."""
+        with self._read_snapshot():
+            return {
+                "watchlist": self._select_watch_accounts_with_latest(),
+                "events": list(self.iter_recent_events(limit=events_limit)),
+                "failures": list(self.iter_recent_failures(limit=failures_limit)),
+            }
 
     def get_latest_snapshot(self, username: str) -> dict[str, Any] | None:
-        with self._connect() as conn:
+        with self._reader() as conn:
             row = conn.execute(
-                """
-                SELECT username, checked_at, nickname, bio, verified, followers, following, likes, videos_count, profile_url
+                f"""
+                SELECT
+                    username, {_iso("checked_at")} AS checked_at,
+                    nickname, bio, verified, followers, following, likes, videos_count, profile_url
                 FROM snapshots
                 WHERE username = ?
                 ORDER BY id DESC
@@ -177,28 +514,21 @@ class MonitorStore:
                 """,
                 (username,),
             ).fetchone()
-        return _row_to_dict(row) if row else None
+            return dict(zip(SNAPSHOT_COLUMNS, row)) if row else None
 
     def save_snapshot(self, profile: dict[str, Any]) -> None:
-        username = str(profile["username"])
-        checked_at = utc_now_iso()
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO watch_accounts (username, created_at, active)
-                VALUES (?, ?, 1)
-                ON CONFLICT(username) DO NOTHING
-                """,
-                (username, checked_at),
-            )
-            conn.execute(
-                """
-                INSERT INTO snapshots (
-                    username, checked_at, nickname, bio, verified,
-                    followers, following, likes, videos_count, profile_url
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+        self.save_snapshots_bulk([profile])
+
+    def save_snapshots_bulk(self, profiles: list[dict[str, Any]]) -> None:
+        if not profiles:
+            return
+        checked_at = int(time.time())
+        usernames: list[str] = []
+        snapshot_rows: list[tuple[Any, ...]] = []
+        for profile in profiles:
+            username = str(profile["username"])
+            usernames.append(username)
+            snapshot_rows.append(
                 (
                     username,
                     checked_at,
@@ -210,21 +540,37 @@ class MonitorStore:
                     _to_int(profile.get("likes")),
                     _to_int(profile.get("videos_count")),
                     profile.get("profile_url") or f"https://www.tiktok.com/@{username}",
-                ),
+                )
             )
-            conn.execute(
+
+        with self._transaction() as conn:
+            conn.executemany(
                 """
-                UPDATE watch_accounts
-                SET last_checked_at = ?, last_error = NULL
-                WHERE username = ?
+                INSERT INTO watch_accounts (username, created_at, active, last_checked_at, last_error)
+                VALUES (?, ?, 1, ?, NULL)
+                ON CONFLICT(username) DO UPDATE SET
+                    last_checked_at = excluded.last_checked_at,
+                    last_error = NULL
                 """,
-                (checked_at, username),
+                [(username, checked_at, checked_at) for username in usernames],
             )
+            conn.executemany(
+                """
+                INSERT INTO snapshots (
+                    username, checked_at, nickname, bio, verified,
+                    followers, following, likes, videos_count, profile_url
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                snapshot_rows,
+            )
+        self._invalidate_read_cache()
+        self.maybe_optimize()
 
     def record_events(self, username: str, events: list[dict[str, Any]]) -> None:
         if not events:
             return
-        detected_at = utc_now_iso()
+        detected_at = int(time.time())
         values = [
             (
                 username,
@@ -237,94 +583,142 @@ class MonitorStore:
             )
             for event in events
         ]
-        with self._connect() as conn:
-            conn.executemany(
-                """
-                INSERT INTO events (
-                    username, detected_at, metric, old_value, new_value, delta, message
+        # One multi-row INSERT per chunk binds everything in a single execute()
+        # instead of a per-row executemany() dispatch.
+        rows_per_statement = max(1, SQL_VARIABLES_PER_STATEMENT // len(values[0]))
+        with self._transaction() as conn:
+            for start in range(0, len(values), rows_per_statement):
+                chunk = values[start : start + rows_per_statement]
+                placeholders = ", ".join(["(?, ?, ?, ?, ?, ?, ?)"] * len(chunk))
+                conn.execute(
+                    f"""
+                    INSERT INTO events (
+                        username, detected_at, metric, old_value, new_value, delta, message
+                    )
+                    VALUES {placeholders}
+                    """,
+                    list(chain.from_iterable(chunk)),
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                values,
-            )
+        self._invalidate_read_cache()
 
     def record_failure(self, username: str, error: str) -> None:
-        checked_at = utc_now_iso()
-        with self._connect() as conn:
+        checked_at = int(time.time())
+        with self._transaction() as conn:
             conn.execute(
                 """
-                INSERT INTO watch_accounts (username, created_at, active)
-                VALUES (?, ?, 1)
-                ON CONFLICT(username) DO NOTHING
+                INSERT INTO watch_accounts (username, created_at, active, last_checked_at, last_error)
+                VALUES (?, ?, 1, ?, ?)
+                ON CONFLICT(username) DO UPDATE SET
+                    last_checked_at = excluded.last_checked_at,
+                    last_error = excluded.last_error
                 """,
-                (username, checked_at),
+                (username, checked_at, checked_at, error),
             )
             conn.execute(
                 "INSERT INTO failures (username, checked_at, error) VALUES (?, ?, ?)",
                 (username, checked_at, error),
             )
-            conn.execute(
-                """
-                UPDATE watch_accounts
-                SET last_checked_at = ?, last_error = ?
-                WHERE username = ?
-                """,
-                (checked_at, error, username),
-            )
+        self._invalidate_read_cache()
+        self.maybe_optimize()
+
+    def purge_older_than(self, days: int = 30) -> int:
+        """Delete history older than ``days`` (keeping each latest snapshot); return the row count."""
+        cutoff = int(time.time()) - days * 86400
+        deleted = 0
+        for table, condition in PURGE_CONDITIONS.items():
+            while True:
+                with self._transaction() as conn:
+                    rowcount = conn.execute(
+                        f"DELETE FROM {table} WHERE id IN "
+                        f"(SELECT id FROM {table} WHERE {condition} LIMIT ?)",
+                        (cutoff, PURGE_BATCH_SIZE),
+                    ).rowcount
+                deleted += rowcount
+                if rowcount < PURGE_BATCH_SIZE:
+                    break
+        if deleted:
+            self._invalidate_read_cache()
+            self.maybe_optimize()
+        return deleted
+
+    def _iter_rows(
+        self, query: str, params: tuple[Any, ...], columns: tuple[str, ...]
+    ) -> Iterator[dict[str, Any]]:
+        # Rows are pulled in fixed-size batches. The read connection is held until
+        # the iterator is exhausted, so callers must not hold one across client I/O.
+        with self._reader() as conn, closing(conn.execute(query, params)) as cursor:
+            while True:
+                rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+                if not rows:
+                    return
+                for row in rows:
+                    yield dict(zip(columns, row))
+
+    def iter_recent_events(self, limit: int = 50, before_id: int | None = None) -> Iterator[dict[str, Any]]:
+        query = f"""
+            SELECT
+                id, username, {_iso("detected_at")} AS detected_at,
+                metric, old_value, new_value, delta, message
+            FROM events
+        """
+        params: tuple[Any, ...] = ()
+        if before_id is not None:
+            query += " WHERE id < ?"
+            params = (before_id,)
+        query += " ORDER BY id DESC LIMIT ?"
+        return self._iter_rows(query, params + (limit,), EVENT_COLUMNS)
 
     def get_recent_events(self, limit: int = 50) -> list[dict[str, Any]]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT id, username, detected_at, metric, old_value, new_value, delta, message
-                FROM events
-                ORDER BY id DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-        return [_row_to_dict(row) for row in rows]
+        return list(self.iter_recent_events(limit=limit))
+
+    def iter_recent_failures(self, limit: int = 25, before_id: int | None = None) -> Iterator[dict[str, Any]]:
+        query = f"""
+            SELECT id, username, {_iso("checked_at")} AS checked_at, error
+            FROM failures
+        """
+        params: tuple[Any, ...] = ()
+        if before_id is not None:
+            query += " WHERE id < ?"
+            params = (before_id,)
+        query += " ORDER BY id DESC LIMIT ?"
+        return self._iter_rows(query, params + (limit,), FAILURE_COLUMNS)
 
     def get_recent_failures(self, limit: int = 25) -> list[dict[str, Any]]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT id, username, checked_at, error
-                FROM failures
-                ORDER BY id DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-        return [_row_to_dict(row) for row in rows]
+        return list(self.iter_recent_failures(limit=limit))
+
+    def iter_snapshots(
+        self, username: str, limit: int = 20, before_id: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        query = f"""
+            SELECT
+                id, username, {_iso("checked_at")} AS checked_at,
+                nickname, bio, verified, followers, following, likes, videos_count, profile_url
+            FROM snapshots
+            WHERE username = ?
+        """
+        params: tuple[Any, ...] = (username,)
+        if before_id is not None:
+            query += " AND id < ?"
+            params += (before_id,)
+        query += " ORDER BY id DESC LIMIT ?"
+        return self._iter_rows(query, params + (limit,), SNAPSHOT_PAGE_COLUMNS)
 
     def get_snapshots(self, username: str, limit: int = 20) -> list[dict[str, Any]]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT id, username, checked_at, nickname, bio, verified, followers, following, likes, videos_count, profile_url
-                FROM snapshots
-                WHERE username = ?
-                ORDER BY id DESC
-                LIMIT ?
-                """,
-                (username, limit),
-            ).fetchall()
-        return [_row_to_dict(row) for row in rows]
+        return list(self.iter_snapshots(username, limit=limit))
 
     def get_setting(self, key: str) -> str | None:
-        with self._connect() as conn:
+        with self._reader() as conn:
             row = conn.execute(
                 "SELECT value FROM settings WHERE key = ?",
                 (key,),
             ).fetchone()
         if not row:
             return None
-        return str(row["value"])
+        return str(row[0])
 
     def set_setting(self, key: str, value: str) -> None:
-        now = utc_now_iso()
-        with self._connect() as conn:
+        now = int(time.time())
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO settings (key, value, updated_at)
@@ -336,20 +730,38 @@ class MonitorStore:
                 (key, value, now),
             )
 
+    def set_settings_bulk(self, values: dict[str, str]) -> None:
+        if not values:
+            return
+        now = int(time.time())
+        with self._transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO settings (key, value, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    updated_at = excluded.updated_at
+                """,
+                [(key, value, now) for key, value in values.items()],
+            )
+
     def get_all_settings(self) -> dict[str, str]:
-        with self._connect() as conn:
+        with self._reader() as conn:
             rows = conn.execute(
                 "SELECT key, value FROM settings ORDER BY key ASC"
             ).fetchall()
-        return {str(row["key"]): str(row["value"]) for row in rows}
+        return {str(key): str(value) for key, value in rows}
 
     def clear_monitor_data(self) -> None:
-        with self._connect() as conn:
-            conn.executescript(
-                """
-                DELETE FROM events;
-                DELETE FROM failures;
-                DELETE FROM snapshots;
-                DELETE FROM watch_accounts;
-                """
-            )
+        # executescript() would commit the open transaction, so run the deletes one by one.
+        # Unqualified DELETEs hit SQLite's truncate fast path.
+        with self._transaction() as conn:
+            for table in ("events", "failures", "snapshots", "watch_accounts"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name IN ('events', 'failures', 'snapshots')")
+        self._invalidate_read_cache()
+        if not getattr(self._local, "in_txn", False):
+            # Hand the freed pages back to the filesystem; only settings remain.
+            with self._write_lock:
+                self._write_conn.execute("VACUUM")